@@ -1,4 +1,5 @@
 from neo4j_manager import Neo4jGraph, Node, Relationship
+from write_buffer import Neo4jWriteBuffer
 
 
 def main():
@@ -6,6 +7,18 @@ def main():
         # Crear una instancia de Neo4jGraph con las credenciales adecuadas
         graph = Neo4jGraph("bolt://127.0.0.1:7687", "neo4j", "password")
 
+        # Garantizar que MERGE no duplique nodos aunque haya escritores concurrentes. El título de
+        # una reseña no la identifica, por lo que no se restringe; si los datos existentes ya tienen
+        # duplicados la restricción falla, y la carga continúa sin ella.
+        for label, key in (("Person", "name"), ("Movie", "title")):
+            try:
+                print(graph.create_unique_constraint(label, key))
+            except RuntimeError as e:
+                print(f"No se pudo crear la restricción de unicidad {label}.{key}: {e}")
+
+        # Encolar las escrituras y aplicarlas por lotes, en una transacción por lote
+        writes = Neo4jWriteBuffer(graph, batch_size=50)
+
         # Crear 4 nodos de "usuarios"
         users = [
             Node("Person", {"name": "Alice", "age": 30, "city": "Wonderland"}),
@@ -15,7 +28,10 @@ def main():
         ]
 
         for user in users:
-            print(graph.create_node(user))
+            writes.create_node(user)
+
+        for result in writes.flush():
+            print(result)
 
         nodes = graph.get_all_nodes("Person")
         print(nodes)
@@ -29,7 +45,7 @@ def main():
         ]
 
         for movie in movies:
-            print(graph.create_node(movie))
+            writes.create_node(movie)
 
         reviews = [
             Node("Review", {"title": "ITS BAD", "rating": 1.5, "content": "So bad, I hate it"}),
@@ -46,46 +62,52 @@ def main():
         ]
 
         for review in reviews:
-            print(graph.create_node(review))
+            writes.create_node(review)
 
         # Crear relaciones FAVORITE desde cada usuario hacia una película seleccionada al azar
-        graph.create_relationship(Relationship(Node("Person", {"name": "Alice"}), Node("Review", {"title": "ITS BAD"}), "MADE_A"))
-        graph.create_relationship(Relationship(Node("Person", {"name": "Alice"}), Node("Review", {"title": "SO GOOD!!"}), "MADE_A"))
-        graph.create_relationship(Relationship(Node("Person", {"name": "Bob"}), Node("Review", {"title": "Mid"}), "MADE_A"))
-        graph.create_relationship(Relationship(Node("Person", {"name": "Charlie"}), Node("Review", {"title": "Ummm"}), "MADE_A"))
-        graph.create_relationship(
+        writes.create_relationship(Relationship(Node("Person", {"name": "Alice"}), Node("Review", {"title": "ITS BAD"}), "MADE_A"))
+        writes.create_relationship(Relationship(Node("Person", {"name": "Alice"}), Node("Review", {"title": "SO GOOD!!"}), "MADE_A"))
+        writes.create_relationship(Relationship(Node("Person", {"name": "Bob"}), Node("Review", {"title": "Mid"}), "MADE_A"))
+        writes.create_relationship(Relationship(Node("Person", {"name": "Charlie"}), Node("Review", {"title": "Ummm"}), "MADE_A"))
+        writes.create_relationship(
             Relationship(Node("Person", {"name": "David"}), Node("Review", {"title": "Very nice"}), "MADE_A"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Person", {"name": "Charlie"}), Node("Review", {"title": "Cinema"}), "MADE_A"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Person", {"name": "Bob"}), Node("Review", {"title": "Hello"}), "MADE_A"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Person", {"name": "Charlie"}), Node("Review", {"title": "Nose"}), "MADE_A"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Person", {"name": "Charlie"}), Node("Review", {"title": "Trash"}), "MADE_A"))
 
+        for result in writes.flush():
+            print(result)
+
         reseñas_alice = graph.get_outgoing_related_nodes(Node("Person", {"name": "Alice"}), "MADE_A")
         print(f"Reseñas hechas por Alice = {reseñas_alice}")
 
-        graph.create_relationship(Relationship(Node("Review", {"title": "ITS BAD"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
-        graph.create_relationship(Relationship(Node("Review", {"title": "SO GOOD!!"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
-        graph.create_relationship(Relationship(Node("Review", {"title": "Ummm"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
-        graph.create_relationship(Relationship(Node("Review", {"title": "Mid"}), Node("Movie", {"title": "The Secret Sin"}), "BELONGS_TO"))
+        writes.create_relationship(Relationship(Node("Review", {"title": "ITS BAD"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
+        writes.create_relationship(Relationship(Node("Review", {"title": "SO GOOD!!"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
+        writes.create_relationship(Relationship(Node("Review", {"title": "Ummm"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
+        writes.create_relationship(Relationship(Node("Review", {"title": "Mid"}), Node("Movie", {"title": "The Secret Sin"}), "BELONGS_TO"))
 
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Review", {"title": "Very nice"}), Node("Movie", {"title": "Oscar et la dame rose"}),
                          "BELONGS_TO"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Review", {"title": "Cinema"}), Node("Movie", {"title": "Oscar et la dame rose"}),
                          "BELONGS_TO"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Review", {"title": "Hello"}), Node("Movie", {"title": "Oscar et la dame rose"}),
                          "BELONGS_TO"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Review", {"title": "Nose"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
-        graph.create_relationship(
+        writes.create_relationship(
             Relationship(Node("Review", {"title": "Trash"}), Node("Movie", {"title": "Oscar et la dame rose"}), "BELONGS_TO"))
 
+        for result in writes.close():
+            print(result)
+
         # Encuentra todas las Reviews pertenecientes a la Película The Matrix
         reseñas = graph.get_incoming_related_nodes("BELONGS_TO", Node("Movie", {"title": "Oscar et la dame rose"}))
         print(f"Reseñas de Oscar et la dame rose = {reseñas}")
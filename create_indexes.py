@@ -0,0 +1,24 @@
+from mongodb_manager import MongoDBClient
+from neo4j_manager import Neo4jGraph
+
+
+def main():
+    # Índice de texto de las películas; en una colección grande su construcción puede tardar,
+    # por lo que se crea aquí y no al abrir la interfaz
+    try:
+        mongo_client = MongoDBClient("mongodb://localhost:27017/", "imdb")
+        print(mongo_client.create_text_index("movies", ["TITLE"]))
+        mongo_client.close_connection()
+    except Exception as e:
+        print(f"Error al crear el índice de texto de las películas: {e}")
+
+    # Índice de texto completo de las reseñas
+    try:
+        graph = Neo4jGraph("bolt://127.0.0.1:7687", "neo4j", "password")
+        print(graph.create_fulltext_index("review_fulltext", "Review", ["title", "content"]))
+        graph.close()
+    except Exception as e:
+        print(f"Error al crear el índice de texto completo de las reseñas: {e}")
+
+if __name__ == "__main__":
+    main()
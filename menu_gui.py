@@ -8,9 +8,13 @@ class MovieApp:
     PAGE_SIZE = 25
     MONGO_URI = "mongodb://localhost:27017/"
     MONGO_DB = "imdb"
-    NEO4J_URI = "bolt://127.0.0.1:7687"
+    MONGO_READ_PREFERENCE = "secondaryPreferred"
+    NEO4J_URI = "neo4j://127.0.0.1:7687"
     NEO4J_USER = "neo4j"
     NEO4J_PASSWORD = "password"
+    REVIEW_FULLTEXT_INDEX = "review_fulltext"
+    REVIEW_FULLTEXT_PROPERTIES = ["title", "content"]
+    SEARCH_SCOPES = {"Películas": "movies", "Reseñas": "reviews"}
 
     def __init__(self, root):
         self.root = root
@@ -19,13 +23,17 @@ class MovieApp:
 
         self.mongo_client = None
         self.neo4j_client = None
+        self.review_index_checked = False
 
         self.current_page = 0
         self.current_movie = None
+        self.search_text = None
+        self.search_scope = "movies"
 
         self.setup_ui()
         self.connect_to_mongo()
         self.load_movie_list()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def setup_ui(self):
         self.main_page = ttk.Frame(self.root)
@@ -39,10 +47,26 @@ class MovieApp:
         top_frame.pack(fill=tk.BOTH)
 
         ttk.Label(top_frame, text="Películas en IMDB").pack(side=tk.LEFT, pady=5)
+        self.initialize_search_box(top_frame)
 
         self.retry_mongo_button = ttk.Button(top_frame, text="Reintentar conexión con MongoDB", command=self.retry_mongo_connection)
         self.retry_mongo_button.pack(side=tk.RIGHT, padx=5, pady=5)
 
+    def initialize_search_box(self, top_frame):
+        self.search_entry = ttk.Entry(top_frame, width=40)
+        self.search_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        self.search_entry.bind("<Return>", lambda e: self.search())
+
+        self.search_scope_box = ttk.Combobox(top_frame, values=list(self.SEARCH_SCOPES), state="readonly", width=12)
+        self.search_scope_box.current(0)
+        self.search_scope_box.pack(side=tk.LEFT, padx=5, pady=5)
+
+        search_button = ttk.Button(top_frame, text="Buscar", command=self.search)
+        search_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        clear_button = ttk.Button(top_frame, text="Limpiar búsqueda", command=self.clear_search)
+        clear_button.pack(side=tk.LEFT, padx=5, pady=5)
+
     def initialize_movie_list(self):
         scrollable_frame_container, self.movies_frame = self.create_scrollable_frame(self.main_page)
         scrollable_frame_container.pack(fill=tk.BOTH, expand=True)
@@ -74,11 +98,18 @@ class MovieApp:
 
     def connect_to_mongo(self):
         try:
-            self.mongo_client = MongoDBClient(self.MONGO_URI, self.MONGO_DB)
+            self.mongo_client = MongoDBClient(self.MONGO_URI, self.MONGO_DB,
+                                              read_preference=self.MONGO_READ_PREFERENCE, causal_consistency=True)
         except Exception as e:
             messagebox.showerror("Connection Error", f"Failed to connect to MongoDB: {e}")
             self.mongo_client = None
 
+    def load_current_page(self):
+        if self.search_text and self.search_scope == "reviews":
+            self.load_review_results()
+        else:
+            self.load_movie_list()
+
     def load_movie_list(self):
         if not self.mongo_client:
             self.retry_mongo_button.pack()
@@ -88,6 +119,9 @@ class MovieApp:
         self.clear_movie_list()
 
         if not movies:
+            if self.search_text:
+                messagebox.showinfo("Search", f"No movies found for '{self.search_text}'")
+                return
             messagebox.showwarning("Database Error", "No movies found")
             self.retry_mongo_button.pack()
             return
@@ -100,11 +134,79 @@ class MovieApp:
             collection = "movies"
             skip = self.current_page * self.PAGE_SIZE
             limit = self.PAGE_SIZE
+            if self.search_text:
+                return self.mongo_client.search_documents(collection, self.search_text, skip, limit)
             return self.mongo_client.fetch_documents_with_limit(collection, skip, limit)
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to fetch movies: {e}")
             return []
 
+    def load_review_results(self):
+        if not self.neo4j_client:
+            self.connect_to_neo4j()
+        if not self.neo4j_client:
+            return
+
+        results = self.fetch_review_results()
+        self.clear_movie_list()
+
+        if not results:
+            messagebox.showinfo("Search", f"No reviews found for '{self.search_text}'")
+            return
+
+        for result in results:
+            self.create_review_result_frame(result["node"])
+
+    def fetch_review_results(self, skip=None, limit=None):
+        try:
+            skip = self.current_page * self.PAGE_SIZE if skip is None else skip
+            limit = self.PAGE_SIZE if limit is None else limit
+            return self.neo4j_client.search_fulltext(self.REVIEW_FULLTEXT_INDEX, self.search_text, skip, limit)
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Failed to search reviews: {e}")
+            return []
+
+    def create_review_result_frame(self, review):
+        review_frame = self.create_review_frame(review, self.movies_frame)
+        movie_button = ttk.Button(review_frame, text="Ver película", command=lambda: self.show_review_movie(review))
+        movie_button.pack(pady=5)
+
+    def show_review_movie(self, review):
+        if not self.mongo_client:
+            messagebox.showerror("Connection Error", "MongoDB connection not founded")
+            return
+
+        try:
+            movies = self.neo4j_client.get_outgoing_related_nodes(Node("Review", {"title": review.properties['title']}), "BELONGS_TO")
+            movie = self.mongo_client.fetch_document("movies", {"TITLE": movies[0].properties['title']}) if movies else None
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Failed to fetch the movie: {e}")
+            return
+
+        if not movie:
+            messagebox.showwarning("Database Error", "Movie not found for this review")
+            return
+
+        self.show_movie_details({key: value for key, value in movie.items() if key != '_id'})
+
+    def search(self):
+        text = self.search_entry.get().strip()
+        if not text:
+            self.clear_search()
+            return
+
+        self.search_text = text
+        self.search_scope = self.SEARCH_SCOPES[self.search_scope_box.get()]
+        self.current_page = 0
+        self.load_current_page()
+
+    def clear_search(self):
+        self.search_entry.delete(0, tk.END)
+        self.search_text = None
+        self.search_scope = "movies"
+        self.current_page = 0
+        self.load_current_page()
+
     def clear_movie_list(self):
         for widget in self.movies_frame.winfo_children():
             widget.destroy()
@@ -113,7 +215,7 @@ class MovieApp:
         movie_index = self.current_page * self.PAGE_SIZE + 1
 
         for movie in movies:
-            movie_details = {key: value for key, value in movie.items() if key != '_id'}
+            movie_details = {key: value for key, value in movie.items() if key not in ('_id', '_score')}
             self.create_movie_button(movie_index, movie_details, self.movies_frame)
             movie_index += 1
 
@@ -127,7 +229,8 @@ class MovieApp:
     def show_movie_details(self, movie):
         self.current_movie = movie
         self.setup_details_ui()
-        self.connect_to_neo4j()
+        if not self.neo4j_client:
+            self.connect_to_neo4j()
         self.load_reviews()
 
     def setup_details_ui(self):
@@ -166,11 +269,24 @@ class MovieApp:
             ttk.Label(self.movie_details_frame, text=f"{key}: {value}", wraplength=600, justify="left").pack(pady=10)
 
     def connect_to_neo4j(self):
+        if self.neo4j_client:
+            self.neo4j_client.close()
         try:
             self.neo4j_client = Neo4jGraph(self.NEO4J_URI, self.NEO4J_USER, self.NEO4J_PASSWORD)
         except Exception as e:
             messagebox.showerror("Connection Error", f"Failed to connect to Neo4j: {e}")
             self.neo4j_client = None
+            return
+
+        if not self.review_index_checked:
+            self.create_review_search_index()
+
+    def create_review_search_index(self):
+        self.review_index_checked = True
+        try:
+            self.neo4j_client.create_fulltext_index(self.REVIEW_FULLTEXT_INDEX, "Review", self.REVIEW_FULLTEXT_PROPERTIES)
+        except Exception as e:
+            messagebox.showwarning("Database Error", f"Failed to create the review search index: {e}")
 
     def load_reviews(self):
         if not self.neo4j_client:
@@ -200,12 +316,13 @@ class MovieApp:
         reviews_label.pack()
 
         for review in reviews:
-            self.create_review_frame(review)
+            self.create_review_frame(review, self.scrollable_reviews_frame)
 
-    def create_review_frame(self, review):
-        review_frame = ttk.Frame(self.scrollable_reviews_frame, relief=tk.SUNKEN, padding=40)
+    def create_review_frame(self, review, frame):
+        review_frame = ttk.Frame(frame, relief=tk.SUNKEN, padding=40)
         review_frame.pack()
         self.create_review_labels(review_frame, review)
+        return review_frame
 
     def create_review_labels(self, review_frame, review):
         review_title = review.properties['title']
@@ -228,38 +345,59 @@ class MovieApp:
         self.connect_to_neo4j()
         self.load_reviews()
 
+    def on_closing(self):
+        if self.neo4j_client:
+            self.neo4j_client.close()
+        if self.mongo_client:
+            self.mongo_client.close_connection()
+        self.root.destroy()
+
     def go_back_to_main(self):
         self.details_page.pack_forget()
         self.main_page.pack(fill=tk.BOTH, expand=True)
 
     def next_page(self):
-        if not self.mongo_client:
-            messagebox.showerror("Connection Error", "MongoDB connection not founded")
+        if not self.has_search_client():
             return
 
         try:
             if self.has_more_movies():
                 self.current_page += 1
-                self.load_movie_list()
+                self.load_current_page()
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to fetch movies: {e}")
 
+    def has_search_client(self):
+        if self.search_text and self.search_scope == "reviews":
+            if not self.neo4j_client:
+                messagebox.showerror("Connection Error", "Neo4j connection not founded")
+                return False
+            return True
+
+        if not self.mongo_client:
+            messagebox.showerror("Connection Error", "MongoDB connection not founded")
+            return False
+        return True
+
     def has_more_movies(self):
         next_page_index = (self.current_page + 1) * self.PAGE_SIZE
         movies = self.fetch_movies_for_next_page(next_page_index)
         return len(movies) > 0
 
     def fetch_movies_for_next_page(self, start_index):
+        if self.search_text and self.search_scope == "reviews":
+            return self.fetch_review_results(start_index, 1)
+        if self.search_text:
+            return self.mongo_client.search_documents("movies", self.search_text, start_index, 1)
         return self.mongo_client.fetch_documents_with_limit("movies", start_index, 1)
 
     def prev_page(self):
-        if not self.mongo_client:
-            messagebox.showerror("Connection Error", "MongoDB connection not founded")
+        if not self.has_search_client():
             return
         try:
             if self.current_page > 0:
                 self.current_page -= 1
-                self.load_movie_list()
+                self.load_current_page()
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to fetch movies: {e}")
 
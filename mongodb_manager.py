@@ -1,10 +1,16 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, TEXT
 from pymongo.errors import ConnectionFailure, OperationFailure
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+from contextlib import contextmanager
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
+from query_profiler import QueryProfile, QueryProfiler
 
 class MongoDBClient:
-    def __init__(self, uri: str, database_name: str, retries: int = 2, delay: float = 0.5):
+    def __init__(self, uri: str, database_name: str, retries: int = 2, delay: float = 0.5,
+                 profile: bool = False, profiler: Optional[QueryProfiler] = None,
+                 read_preference: str = "primary", causal_consistency: bool = False):
         """
         Constructor de la clase MongoDBClient.
 
@@ -13,17 +19,36 @@ class MongoDBClient:
         database_name (str): El nombre de la base de datos a la que se conectará.
         retries (int): Número de intentos de reconexión.
         delay (float): Tiempo en segundos entre intentos de reconexión.
+        profile (bool): Si es verdadero, se obtiene el plan de ejecución (explain) de cada lectura,
+            lo que ejecuta cada lectura dos veces.
+        profiler (QueryProfiler): Registro donde se guardan los planes; se crea uno propio si no se indica.
+        read_preference (str): Miembros del replica set que atienden las lecturas
+            ("primary", "primaryPreferred", "secondary", "secondaryPreferred" o "nearest").
+        causal_consistency (bool): Si es verdadero, todas las operaciones comparten una sesión
+            causalmente consistente con lectura y escritura "majority", de modo que una lectura
+            en un secundario ve las escrituras previas de este cliente. A diferencia de Neo4jGraph,
+            donde los bookmarks no cambian cómo se confirma una escritura, aquí cada escritura espera
+            a la mayoría del replica set, por lo que la opción está desactivada por defecto.
 
         Intenta establecer una conexión con la base de datos y verifica su disponibilidad.
         """
         self.client = None
         self.db = None
+        self.session = None
+        self.profile_queries = profile
+        self.profiler = profiler or QueryProfiler()
         for attempt in range(retries):
             try:
-                self.client = MongoClient(uri)
-                self.db = self.client[database_name]
+                self.client = MongoClient(uri, readPreference=read_preference)
+                if causal_consistency:
+                    self.db = self.client.get_database(database_name, read_concern=ReadConcern("majority"),
+                                                       write_concern=WriteConcern("majority"))
+                else:
+                    self.db = self.client[database_name]
                 # Verificar la conexión ejecutando una operación simple.
                 self.db.command("ping")
+                if causal_consistency:
+                    self.session = self.client.start_session(causal_consistency=True)
                 break  # Exit loop if successful
             except ConnectionFailure as e:
                 if attempt < retries - 1:
@@ -35,14 +60,26 @@ class MongoDBClient:
 
     def close_connection(self):
         """Cierra la conexión con la base de datos."""
+        if self.session:
+            self.session.end_session()
         if self.client:
             self.client.close()
 
+    @contextmanager
+    def profiling(self):
+        """Perfila las lecturas ejecutadas dentro del bloque with y entrega el perfilador."""
+        previous = self.profile_queries
+        self.profile_queries = True
+        try:
+            yield self.profiler
+        finally:
+            self.profile_queries = previous
+
     def insert_document(self, collection_name: str, document: Dict[str, Any]) -> str:
         """Inserta un documento en la colección especificada."""
         try:
             collection = self.db[collection_name]
-            result = collection.insert_one(document)
+            result = collection.insert_one(document, session=self.session)
             return f'Documento con _id {result.inserted_id} ha sido creado.'
         except OperationFailure as e:
             raise RuntimeError(f"Error al insertar el documento: {e}")
@@ -51,8 +88,8 @@ class MongoDBClient:
         """Recupera un documento de la colección especificada."""
         try:
             collection = self.db[collection_name]
-            document = collection.find_one(query)
-            return document
+            documents = self._fetch(collection_name, query, collection.find(query, session=self.session).limit(1))
+            return documents[0] if documents else None
         except OperationFailure as e:
             raise RuntimeError(f"Error al recuperar el documento: {e}")
 
@@ -60,7 +97,8 @@ class MongoDBClient:
         """Recupera documentos de la colección especificada con un límite."""
         try:
             collection = self.db[collection_name]
-            return list(collection.find().skip(skip).limit(limit))
+            cursor = collection.find(session=self.session).skip(skip).limit(limit)
+            return self._fetch(collection_name, {}, cursor)
         except OperationFailure as e:
             raise RuntimeError(f"Error al recuperar los documentos: {e}")
 
@@ -68,7 +106,7 @@ class MongoDBClient:
         """Actualiza un documento en la colección especificada."""
         try:
             collection = self.db[collection_name]
-            result = collection.update_one(query, {"$set": update})
+            result = collection.update_one(query, {"$set": update}, session=self.session)
             if result.modified_count > 0:
                 return f'Documento coincidente con {query} ha sido actualizado.'
             else:
@@ -80,10 +118,103 @@ class MongoDBClient:
         """Elimina un documento de la colección especificada."""
         try:
             collection = self.db[collection_name]
-            result = collection.delete_one(query)
+            result = collection.delete_one(query, session=self.session)
             if result.deleted_count > 0:
                 return f'Documento coincidente con {query} ha sido eliminado.'
             else:
                 return f'No se encontró ningún documento coincidente con {query} para eliminar.'
         except OperationFailure as e:
             raise RuntimeError(f"Error al eliminar el documento: {e}")
+
+    def create_text_index(self, collection_name: str, fields: Iterable[str], index_name: Optional[str] = None) -> str:
+        """
+        Crea (si no existe) el índice de texto de la colección especificada.
+
+        MongoDB admite un único índice de texto por colección, por lo que todos los
+        campos a buscar deben incluirse en la misma llamada.
+        """
+        try:
+            collection = self.db[collection_name]
+            keys = [(field, TEXT) for field in fields]
+            name = collection.create_index(keys, name=index_name or f'{collection_name}_text',
+                                           session=self.session)
+            return f'Índice de texto {name} disponible en {collection_name}.'
+        except OperationFailure as e:
+            raise RuntimeError(f"Error al crear el índice de texto: {e}")
+
+    def bulk_write(self, collection_name: str, requests: List[Any]) -> str:
+        """
+        Aplica en orden, con una sola llamada, varias operaciones sobre la colección especificada.
+
+        Las operaciones son instancias de InsertOne, UpdateOne o DeleteOne de pymongo. Si la
+        llamada falla, la causa de la excepción es el error de pymongo (BulkWriteError indica
+        en sus detalles qué operaciones alcanzaron a aplicarse).
+        """
+        try:
+            collection = self.db[collection_name]
+            result = collection.bulk_write(requests, ordered=True, session=self.session)
+            return (f'{result.inserted_count} documentos creados, {result.modified_count} actualizados y '
+                    f'{result.deleted_count} eliminados en {collection_name}.')
+        except OperationFailure as e:
+            raise RuntimeError(f"Error al aplicar las operaciones: {e}") from e
+
+    def search_documents(self, collection_name: str, text: str, skip: int = 0, limit: int = 25) -> List[Dict]:
+        """
+        Busca documentos por texto en la colección especificada usando su índice de texto.
+
+        Los resultados se ordenan por relevancia y cada documento incluye su puntuación
+        en el campo '_score'.
+        """
+        if not text or not text.strip():
+            return []
+        try:
+            collection = self.db[collection_name]
+            score = {"$meta": "textScore"}
+            cursor = collection.find({"$text": {"$search": text}}, {"_score": score}, session=self.session)
+            cursor = cursor.sort([("_score", score)]).skip(skip).limit(limit)
+            return self._fetch(collection_name, {"$text": {"$search": text}}, cursor)
+        except OperationFailure as e:
+            raise RuntimeError(f"Error al buscar los documentos: {e}")
+
+    def _fetch(self, collection_name: str, query: Dict[str, Any], cursor) -> List[Dict]:
+        """
+        Recupera los documentos del cursor y, si el perfilado está activo, registra su plan.
+
+        La duración registrada es el tiempo medido en el cliente para obtener los documentos,
+        igual que en Neo4jGraph. Obtener el plan con explain() vuelve a ejecutar la consulta,
+        por lo que cada lectura perfilada se ejecuta dos veces.
+        """
+        if not self.profile_queries:
+            return list(cursor)
+
+        explain_cursor = cursor.clone()
+        start = time.perf_counter()
+        documents = list(cursor)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        explain = explain_cursor.explain()
+        stats = explain.get("executionStats", {})
+        stages = list(self._plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        self.profiler.record(QueryProfile(
+            database="mongodb",
+            query=f"{collection_name}.find({query})",
+            duration_ms=duration_ms,
+            db_hits=stats.get("totalKeysExamined", 0) + stats.get("totalDocsExamined", 0),
+            rows=stats.get("nReturned", 0),
+            indexes=[stage["indexName"] for stage in stages if "indexName" in stage],
+            operators=[stage["stage"] for stage in stages],
+            plan=explain,
+        ))
+        return documents
+
+    def _plan_stages(self, plan):
+        """Recorre todas las etapas (COLLSCAN, IXSCAN, FETCH...) de un plan de ejecución."""
+        if isinstance(plan, list):
+            for item in plan:
+                yield from self._plan_stages(item)
+        elif isinstance(plan, dict):
+            if "stage" in plan:
+                yield plan
+            for value in plan.values():
+                if isinstance(value, (dict, list)):
+                    yield from self._plan_stages(value)
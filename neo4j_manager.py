@@ -1,7 +1,40 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS
 from neo4j.exceptions import ServiceUnavailable, Neo4jError
-from dataclasses import dataclass
-from typing import Callable, Any, List, Dict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Any, List, Dict, Iterable, Optional
+from query_profiler import QueryProfile, QueryProfiler
+import re
+import time
+
+# Caracteres y operadores reservados por la sintaxis de consultas de Lucene.
+LUCENE_SPECIAL_CHARACTERS = set('+-&|!(){}[]^"~*?:\\/')
+LUCENE_OPERATORS = re.compile(r"\b(AND|OR|NOT|TO)\b")
+
+# Contadores de la consulta que se exponen en cada WriteResult.
+WRITE_COUNTERS = ('nodes_created', 'nodes_deleted', 'relationships_created', 'relationships_deleted', 'properties_set')
+
+# Personas que reseñaron las mismas películas que (p), con una similitud basada en
+# la diferencia media entre sus calificaciones.
+SIMILARITY_CLAUSE = (
+    "MATCH (p)-[:MADE_A]->(r1:Review)-[:BELONGS_TO]->(shared:Movie)<-[:BELONGS_TO]-(r2:Review)<-[:MADE_A]-(other:Person) "
+    "WHERE other <> p "
+    "WITH p, other, count(DISTINCT shared) AS shared_movies, avg(abs(r1.rating - r2.rating)) AS rating_distance "
+    "WHERE shared_movies >= $min_shared "
+    "WITH p, other, shared_movies, 1.0 / (1.0 + rating_distance) AS similarity "
+)
+
+# Personas similares a (p) según las relaciones SIMILAR_TO precalculadas.
+PRECOMPUTED_SIMILARITY_CLAUSE = (
+    "MATCH (p)-[s:SIMILAR_TO]->(other:Person) "
+    "WHERE s.shared_movies >= $min_shared "
+    "WITH p, other, s.shared_movies AS shared_movies, s.score AS similarity "
+)
+
+# Las sentencias de esquema (índices, restricciones y SHOW) no admiten PROFILE; CREATE de nodos sí.
+SCHEMA_QUERY = re.compile(
+    r"^\s*(CREATE|DROP)\s+(CONSTRAINT|(FULLTEXT\s+|RANGE\s+|TEXT\s+|POINT\s+|LOOKUP\s+|VECTOR\s+)?INDEX)|^\s*SHOW\b",
+    re.IGNORECASE)
 
 
 @dataclass
@@ -17,11 +50,102 @@ class Relationship:
     relationship_type: str
 
 
+@dataclass
+class WriteResult:
+    """Resultado de una escritura: 'created', 'updated', 'exists', 'deleted' o 'not_found'."""
+    status: str
+    message: str
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        """Indica si la escritura modificó la base de datos."""
+        return self.status in ('created', 'updated', 'deleted')
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ProfiledResult:
+    """Resultado ya consumido de una consulta ejecutada con PROFILE."""
+
+    def __init__(self, records: List[Any], summary):
+        self._records = records
+        self._summary = summary
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def consume(self):
+        return self._summary
+
+
+class ProfilingTransaction:
+    """Envoltorio de una transacción que ejecuta cada consulta con PROFILE y registra su plan."""
+
+    def __init__(self, tx, profiler: QueryProfiler):
+        self._tx = tx
+        self._profiler = profiler
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwparameters: Any):
+        """Ejecuta una consulta con PROFILE y registra su plan en el perfilador."""
+        if SCHEMA_QUERY.match(query):
+            return self._tx.run(query, parameters, **kwparameters)
+
+        start = time.perf_counter()
+        result = self._tx.run(f"PROFILE {query}", parameters, **kwparameters)
+        records = list(result)
+        summary = result.consume()
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._profiler.record(self._query_profile(query, duration_ms, summary.profile or {}))
+        return ProfiledResult(records, summary)
+
+    def _query_profile(self, query: str, duration_ms: float, plan: Dict[str, Any]) -> QueryProfile:
+        """Resume el plan de ejecución de una consulta: accesos a la base, filas e índices usados."""
+        operators = list(self._plan_operators(plan))
+        indexes = [operator.get("args", {}).get("Details", operator["operatorType"])
+                   for operator in operators if "Index" in operator["operatorType"]]
+        return QueryProfile(database="neo4j", query=query, duration_ms=duration_ms,
+                            db_hits=sum(operator.get("dbHits", 0) for operator in operators),
+                            rows=plan.get("rows", 0), indexes=indexes,
+                            operators=[operator["operatorType"].split("@")[0] for operator in operators],
+                            plan=plan)
+
+    def _plan_operators(self, plan: Dict[str, Any]):
+        """Recorre todos los operadores de un plan de ejecución."""
+        if not plan:
+            return
+        yield plan
+        for child in plan.get("children", []):
+            yield from self._plan_operators(child)
+
+
 class Neo4jGraph:
     """Clase para interactuar con una base de datos Neo4j."""
 
-    def __init__(self, uri, user, password):
-        """Inicializa la conexión a la base de datos Neo4j."""
+    def __init__(self, uri, user, password, profile: bool = False, profiler: Optional[QueryProfiler] = None,
+                 database: Optional[str] = None, read_from_replicas: bool = True, causal_consistency: bool = True):
+        """
+        Inicializa la conexión a la base de datos Neo4j.
+
+        Si profile es verdadero, todas las consultas se ejecutan con PROFILE y sus planes
+        se registran en profiler (o en un QueryProfiler propio si no se indica ninguno).
+
+        Con una URI neo4j:// las lecturas se enrutan a seguidores y réplicas de lectura
+        (read_from_replicas) o al líder. Si causal_consistency es verdadero, cada sesión
+        recibe los bookmarks de la última escritura, de modo que las lecturas posteriores
+        ven lo escrito aunque las atienda otro miembro del clúster. Está activada por defecto
+        porque solo encadena sesiones; las escrituras se confirman igual con o sin ella.
+        """
+        self.profile_queries = profile
+        self.profiler = profiler or QueryProfiler()
+        self.database = database
+        self.read_from_replicas = read_from_replicas
+        self.causal_consistency = causal_consistency
+        self.bookmarks = None
         try:
             self.driver = GraphDatabase.driver(uri, auth=(user, password))
             self._verify_connection()
@@ -35,38 +159,68 @@ class Neo4jGraph:
         if self.driver:
             self.driver.close()
 
+    @contextmanager
+    def profiling(self):
+        """Perfila las consultas ejecutadas dentro del bloque with y entrega el perfilador."""
+        previous = self.profile_queries
+        self.profile_queries = True
+        try:
+            yield self.profiler
+        finally:
+            self.profile_queries = previous
+
     def execute_transaction(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """Ejecuta una transacción en la base de datos Neo4j."""
         try:
-            with self.driver.session() as session:
-                return session.execute_write(func, *args, **kwargs)
+            with self._session(WRITE_ACCESS) as session:
+                result = session.execute_write(self._profiled(func), *args, **kwargs)
+                if self.causal_consistency:
+                    self.bookmarks = session.last_bookmarks()
+                return result
         except Neo4jError as neo4j_error:
             raise RuntimeError(f"Error al ejecutar la transacción: {neo4j_error}") from neo4j_error
 
     def execute_read(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """Ejecuta una operación de lectura en la base de datos Neo4j."""
         try:
-            with self.driver.session() as session:
-                return session.read_transaction(func, *args, **kwargs)
+            if self.read_from_replicas:
+                with self._session(READ_ACCESS) as session:
+                    return session.execute_read(self._profiled(func), *args, **kwargs)
+            with self._session(WRITE_ACCESS) as session:
+                return session.execute_write(self._profiled(func), *args, **kwargs)
         except Neo4jError as neo4j_error:
             raise RuntimeError(f"Error al ejecutar la operación de lectura: {neo4j_error}") from neo4j_error
 
-    def create_node(self, node: Node):
-        """Crea un nodo en la base de datos Neo4j."""
+    def create_node(self, node: Node) -> WriteResult:
+        """Crea un nodo en la base de datos Neo4j si aún no existe."""
         return self.execute_transaction(self._create_node, node)
 
-    def create_relationship(self, relationship: Relationship):
+    def upsert_node(self, node: Node) -> WriteResult:
+        """Crea un nodo en la base de datos Neo4j o actualiza sus propiedades si ya existe."""
+        return self.execute_transaction(self._create_node, node, update_existing=True)
+
+    def create_relationship(self, relationship: Relationship) -> WriteResult:
         """Crea una relación entre dos nodos en la base de datos Neo4j."""
         return self.execute_transaction(self._create_relationship, relationship)
 
-    def delete_node(self, node: Node):
+    def delete_node(self, node: Node) -> WriteResult:
         """Elimina un nodo de la base de datos Neo4j."""
         return self.execute_transaction(self._delete_node, node)
 
-    def delete_relationship(self, relationship: Relationship):
+    def delete_relationship(self, relationship: Relationship) -> WriteResult:
         """Elimina una relación entre dos nodos en la base de datos Neo4j."""
         return self.execute_transaction(self._delete_relationship, relationship)
 
+    def execute_batch(self, writes: List[tuple]) -> List[WriteResult]:
+        """
+        Aplica varias escrituras en una sola transacción de la base de datos Neo4j.
+
+        Cada escritura es una tupla (operación, elemento), donde la operación es el nombre de
+        uno de los métodos create_node, upsert_node, create_relationship, delete_node o
+        delete_relationship, y el elemento es el Node o Relationship correspondiente.
+        """
+        return self.execute_transaction(self._execute_batch, writes)
+
     def get_all_nodes(self, node_label: str) -> List[Node]:
         """Obtiene todos los nodos de un tipo específico en la base de datos Neo4j."""
         return self.execute_read(self._get_all_nodes, node_label)
@@ -87,117 +241,200 @@ class Neo4jGraph:
                                             relationship_type_1, intermediate_node,
                                             relationship_type_2, end_node)
 
-    def _verify_connection(self):
-        """Verifica la conexión a la base de datos Neo4j."""
-        with self.driver.session() as session:
-            session.run("RETURN 1")
-
-    def _node_exists(self, tx, node: Node):
-        """Verifica si un nodo existe en la base de datos Neo4j."""
-        node_label = node.label
-        node_property_key = next(iter(node.properties))
-        node_property_value = next(iter(node.properties.values()))
-
+    def create_unique_constraint(self, label: str, key: str):
+        """Crea (si no existe) una restricción de unicidad sobre la propiedad que identifica a un tipo de nodo."""
+        return self.execute_transaction(self._create_unique_constraint, label, key)
+
+    def create_fulltext_index(self, index_name: str, label: str, properties: Iterable[str]):
+        """Crea (si no existe) un índice de texto completo sobre propiedades de un tipo de nodo."""
+        return self.execute_transaction(self._create_fulltext_index, index_name, label, list(properties))
+
+    def search_fulltext(self, index_name: str, text: str, skip: int = 0, limit: int = 25) -> List[Dict[str, Any]]:
+        """Busca nodos mediante un índice de texto completo, ordenados por relevancia."""
+        if not text or not text.strip():
+            return []
+        return self.execute_read(self._search_fulltext, index_name, text, skip, limit)
+
+    def recommend_movies(self, movie: Node, min_rating: float = 7.0, limit: int = 10) -> List[Dict[str, Any]]:
+        """Obtiene las películas bien calificadas por las personas que reseñaron una película."""
+        return self.execute_read(self._recommend_movies, movie, min_rating, limit)
+
+    def get_similar_reviewers(self, person: Node, min_shared: int = 1, limit: int = 10,
+                              use_precomputed: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene las personas que reseñaron las mismas películas con calificaciones parecidas."""
+        return self.execute_read(self._get_similar_reviewers, person, min_shared, limit, use_precomputed)
+
+    def recommend_movies_for_person(self, person: Node, min_rating: float = 7.0, min_shared: int = 1,
+                                    limit: int = 10, use_precomputed: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene películas no reseñadas por una persona y bien calificadas por personas similares."""
+        return self.execute_read(self._recommend_movies_for_person, person, min_rating, min_shared, limit,
+                                 use_precomputed)
+
+    def refresh_similarity(self, min_shared: int = 1, top_k: int = 20, batch_size: int = 500) -> WriteResult:
+        """
+        Recalcula las relaciones SIMILAR_TO entre personas en un único recorrido de los nodos Person.
+
+        CALL ... IN TRANSACTIONS confirma cada batch_size personas en su propia transacción, por lo
+        que la consulta debe ejecutarse en una transacción implícita y no admite PROFILE.
+        """
         query = (
-            f"MATCH (n:{node_label} {{ {node_property_key}: $node_value }}) "
-            "RETURN COUNT(n) AS count"
+            "MATCH (p:Person) "
+            "CALL (p) { "
+            "CALL (p) { OPTIONAL MATCH (p)-[old:SIMILAR_TO]->() DELETE old } "
+            f"{SIMILARITY_CLAUSE}"
+            "ORDER BY similarity DESC, shared_movies DESC "
+            "WITH p, collect({other: other, similarity: similarity, shared_movies: shared_movies})[..$top_k] AS similar "
+            "UNWIND similar AS s "
+            "WITH p, s.other AS other, s.similarity AS similarity, s.shared_movies AS shared_movies "
+            "MERGE (p)-[rel:SIMILAR_TO]->(other) "
+            "SET rel.score = similarity, rel.shared_movies = shared_movies "
+            "} IN TRANSACTIONS OF $batch_size ROWS"
         )
-        result = tx.run(query, node_value=node_property_value)
-        return result.single()["count"] > 0
+        try:
+            with self._session(WRITE_ACCESS) as session:
+                summary = session.run(query, min_shared=min_shared, top_k=top_k, batch_size=batch_size).consume()
+                if self.causal_consistency:
+                    self.bookmarks = session.last_bookmarks()
+        except Neo4jError as neo4j_error:
+            raise RuntimeError(f"Error al ejecutar la transacción: {neo4j_error}") from neo4j_error
+        return self._write_result('updated',
+                                  f'Similarity refreshed: {summary.counters.relationships_created} relationships created.',
+                                  summary)
 
-    def _relationship_exists(self, tx, relationship: Relationship):
-        """Verifica si una relación existe entre dos nodos en la base de datos Neo4j."""
-        start_node_label = relationship.start_node.label
-        start_node_property_key = next(iter(relationship.start_node.properties))
-        start_node_property_value = next(iter(relationship.start_node.properties.values()))
+    def _session(self, access_mode: str):
+        """Abre una sesión enrutada según el modo de acceso y encadenada a la última escritura."""
+        if self.causal_consistency and self.bookmarks is not None:
+            return self.driver.session(database=self.database, default_access_mode=access_mode,
+                                       bookmarks=self.bookmarks)
+        return self.driver.session(database=self.database, default_access_mode=access_mode)
 
-        end_node_label = relationship.end_node.label
-        end_node_property_key = next(iter(relationship.end_node.properties))
-        end_node_property_value = next(iter(relationship.end_node.properties.values()))
+    def _profiled(self, func: Callable) -> Callable:
+        """Envuelve la transacción que recibe func para perfilar sus consultas, si corresponde."""
+        if not self.profile_queries:
+            return func
 
+        def profiled_func(tx, *args: Any, **kwargs: Any) -> Any:
+            return func(ProfilingTransaction(tx, self.profiler), *args, **kwargs)
+
+        return profiled_func
+
+    def _verify_connection(self):
+        """Verifica la conexión a la base de datos Neo4j."""
+        with self.driver.session(database=self.database) as session:
+            session.run("RETURN 1")
+
+    def _node_key(self, node: Node):
+        """Obtiene la propiedad que identifica a un nodo (la primera de sus propiedades)."""
+        key = next(iter(node.properties))
+        return key, node.properties[key]
+
+    def _write_result(self, status: str, message: str, summary) -> WriteResult:
+        """Construye el resultado estructurado de una escritura a partir de sus contadores."""
+        counters = {name: getattr(summary.counters, name) for name in WRITE_COUNTERS}
+        return WriteResult(status=status, message=message, counters=counters)
+
+    def _create_node(self, tx, node: Node, update_existing: bool = False) -> WriteResult:
+        """
+        Crea un nodo en la base de datos Neo4j, o lo actualiza si ya existe y así se solicita.
+
+        MERGE solo evita duplicados entre escritores concurrentes si existe una restricción
+        de unicidad sobre la propiedad que identifica al nodo (ver create_unique_constraint).
+        """
+        first_key, first_value = self._node_key(node)
+        # Al actualizar solo se escriben las propiedades si alguna cambió, de modo que
+        # properties_set indica si el nodo existente fue realmente modificado.
+        on_match = (
+            "WITH n, [key IN keys($properties) WHERE NOT coalesce(n[key] = $properties[key], false)] AS changed "
+            "SET n += CASE WHEN size(changed) > 0 THEN $properties ELSE {} END"
+        ) if update_existing else ""
         query = (
-            f"MATCH (start:{start_node_label} {{ {start_node_property_key}: $start_value }})-[r:{relationship.relationship_type}]->"
-            f"(end:{end_node_label} {{ {end_node_property_key}: $end_value }}) "
-            "RETURN COUNT(r) AS count"
+            f"MERGE (n:{node.label} {{ {first_key}: $node_value }}) "
+            "ON CREATE SET n += $properties "
+            f"{on_match}"
         )
-        result = tx.run(query, start_value=start_node_property_value, end_value=end_node_property_value)
-        return result.single()["count"] > 0
-
-    def _create_node(self, tx, node: Node):
-        """Crea un nodo en la base de datos Neo4j."""
-        first_key = next(iter(node.properties))
-        first_value = node.properties[first_key]
-        if self._node_exists(tx, node):
-            return f'Node with {first_key}={first_value} already exists.'
+        summary = tx.run(query, node_value=first_value, properties=node.properties).consume()
 
-        properties_str = ', '.join([f"{key}: ${key}" for key in node.properties.keys()])
-        query = f"CREATE (n:{node.label} {{{properties_str}}}) RETURN n"
-        tx.run(query, **node.properties)
-        return f'Node with properties {node.properties} of type {node.label} has been created.'
+        if summary.counters.nodes_created > 0:
+            return self._write_result(
+                'created', f'Node with properties {node.properties} of type {node.label} has been created.', summary)
+        if summary.counters.properties_set > 0:
+            return self._write_result('updated', f'Node with {first_key}={first_value} has been updated.', summary)
+        return self._write_result('exists', f'Node with {first_key}={first_value} already exists.', summary)
 
-    def _create_relationship(self, tx, relationship: Relationship):
+    def _create_relationship(self, tx, relationship: Relationship) -> WriteResult:
         """Crea una relación entre dos nodos en la base de datos Neo4j."""
         start_node_label = relationship.start_node.label
-        start_node_property_key = next(iter(relationship.start_node.properties))
-        start_node_property_value = next(iter(relationship.start_node.properties.values()))
+        start_node_property_key, start_node_property_value = self._node_key(relationship.start_node)
 
         end_node_label = relationship.end_node.label
-        end_node_property_key = next(iter(relationship.end_node.properties))
-        end_node_property_value = next(iter(relationship.end_node.properties.values()))
-
-        if not self._node_exists(tx, relationship.start_node):
-            return f'Node with {start_node_property_key}={start_node_property_value} does not exist.'
-        if not self._node_exists(tx, relationship.end_node):
-            return f'Node with {end_node_property_key}={end_node_property_value} does not exist.'
-        if self._relationship_exists(tx, relationship):
-            return f'Relationship between nodes with {start_node_property_key}={start_node_property_value} and {end_node_property_key}={end_node_property_value} already exists.'
+        end_node_property_key, end_node_property_value = self._node_key(relationship.end_node)
 
         query = (
-            f"MERGE (start:{start_node_label} {{ {start_node_property_key}: $start_value }}) "
-            f"MERGE (end:{end_node_label} {{ {end_node_property_key}: $end_value }}) "
-            f"MERGE (start)-[:{relationship.relationship_type}]->(end) "
-            "RETURN start.name + ' and ' + end.name + ' are now connected.'"
+            f"OPTIONAL MATCH (start:{start_node_label} {{ {start_node_property_key}: $start_value }}) "
+            f"OPTIONAL MATCH (end:{end_node_label} {{ {end_node_property_key}: $end_value }}) "
+            "FOREACH (_ IN CASE WHEN start IS NOT NULL AND end IS NOT NULL THEN [1] ELSE [] END | "
+            f"MERGE (start)-[:{relationship.relationship_type}]->(end)) "
+            "RETURN count(start) > 0 AS start_exists, count(end) > 0 AS end_exists"
         )
         result = tx.run(query, start_value=start_node_property_value, end_value=end_node_property_value)
-        return result.single()[0]
-
-    def _delete_node(self, tx, node: Node):
+        record = result.single()
+        summary = result.consume()
+
+        if not record["start_exists"]:
+            return self._write_result(
+                'not_found', f'Node with {start_node_property_key}={start_node_property_value} does not exist.', summary)
+        if not record["end_exists"]:
+            return self._write_result(
+                'not_found', f'Node with {end_node_property_key}={end_node_property_value} does not exist.', summary)
+        if summary.counters.relationships_created == 0:
+            return self._write_result(
+                'exists',
+                f'Relationship between nodes with {start_node_property_key}={start_node_property_value} and '
+                f'{end_node_property_key}={end_node_property_value} already exists.', summary)
+        return self._write_result(
+            'created', f'{start_node_property_value} and {end_node_property_value} are now connected.', summary)
+
+    def _delete_node(self, tx, node: Node) -> WriteResult:
         """Elimina un nodo de la base de datos Neo4j."""
         node_label = node.label
-        node_property_key = next(iter(node.properties))
-        node_property_value = next(iter(node.properties.values()))
-
-        if not self._node_exists(tx, node):
-            return f'No node with {node_property_key}={node_property_value} found with the label "{node_label}".'
+        node_property_key, node_property_value = self._node_key(node)
 
         query = (
             f"MATCH (n:{node_label} {{ {node_property_key}: $node_value }}) "
             f"DETACH DELETE n "
         )
-        result = tx.run(query, node_value=node_property_value)
-        return f'{node_property_value} has been deleted.'
+        summary = tx.run(query, node_value=node_property_value).consume()
+
+        if summary.counters.nodes_deleted == 0:
+            return self._write_result(
+                'not_found',
+                f'No node with {node_property_key}={node_property_value} found with the label "{node_label}".', summary)
+        return self._write_result('deleted', f'{node_property_value} has been deleted.', summary)
 
-    def _delete_relationship(self, tx, relationship: Relationship):
+    def _delete_relationship(self, tx, relationship: Relationship) -> WriteResult:
         """Elimina una relación entre dos nodos en la base de datos Neo4j."""
         start_node_label = relationship.start_node.label
-        start_node_property_key = next(iter(relationship.start_node.properties))
-        start_node_property_value = next(iter(relationship.start_node.properties.values()))
+        start_node_property_key, start_node_property_value = self._node_key(relationship.start_node)
 
         end_node_label = relationship.end_node.label
-        end_node_property_key = next(iter(relationship.end_node.properties))
-        end_node_property_value = next(iter(relationship.end_node.properties.values()))
-
-        if not self._relationship_exists(tx, relationship):
-            return (f'No relationship found between nodes with '
-                    f'{start_node_property_key}={start_node_property_value} and '
-                    f'{end_node_property_key}={end_node_property_value}.')
+        end_node_property_key, end_node_property_value = self._node_key(relationship.end_node)
 
         query = (
             f"MATCH (start:{start_node_label} {{ {start_node_property_key}: $start_value }})-[r:{relationship.relationship_type}]->"
             f"(end:{end_node_label} {{ {end_node_property_key}: $end_value }}) DELETE r"
         )
-        tx.run(query, start_value=start_node_property_value, end_value=end_node_property_value)
-        return f'Relationship between nodes with {start_node_property_key}={start_node_property_value} and {end_node_property_key}={end_node_property_value} has been deleted.'
+        summary = tx.run(query, start_value=start_node_property_value, end_value=end_node_property_value).consume()
+
+        if summary.counters.relationships_deleted == 0:
+            return self._write_result(
+                'not_found',
+                f'No relationship found between nodes with '
+                f'{start_node_property_key}={start_node_property_value} and '
+                f'{end_node_property_key}={end_node_property_value}.', summary)
+        return self._write_result(
+            'deleted',
+            f'Relationship between nodes with {start_node_property_key}={start_node_property_value} and '
+            f'{end_node_property_key}={end_node_property_value} has been deleted.', summary)
 
     def _get_all_nodes(self, tx, node_label: str) -> List[Node]:
         """Obtiene todos los nodos de un tipo específico en la base de datos Neo4j."""
@@ -230,3 +467,121 @@ class Neo4jGraph:
         )
         result = tx.run(query, property_value=node_property_value)
         return [Node(label=list(record["m"].labels)[0], properties=dict(record["m"])) for record in result]
+
+    def _create_unique_constraint(self, tx, label: str, key: str):
+        """Crea (si no existe) una restricción de unicidad sobre la propiedad que identifica a un tipo de nodo."""
+        constraint_name = f"{label.lower()}_{key}_unique"
+        query = (
+            f"CREATE CONSTRAINT {constraint_name} IF NOT EXISTS "
+            f"FOR (n:{label}) REQUIRE n.{key} IS UNIQUE"
+        )
+        tx.run(query)
+        return f'Unique constraint {constraint_name} on {label}({key}) is available.'
+
+    def _create_fulltext_index(self, tx, index_name: str, label: str, properties: List[str]):
+        """Crea (si no existe) un índice de texto completo sobre propiedades de un tipo de nodo."""
+        properties_str = ', '.join([f"n.{key}" for key in properties])
+        query = (
+            f"CREATE FULLTEXT INDEX {index_name} IF NOT EXISTS "
+            f"FOR (n:{label}) ON EACH [{properties_str}]"
+        )
+        tx.run(query)
+        return f'Full-text index {index_name} on {label}({", ".join(properties)}) is available.'
+
+    def _search_fulltext(self, tx, index_name: str, text: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+        """Busca nodos mediante un índice de texto completo, ordenados por relevancia."""
+        # El procedimiento ya entrega los resultados por relevancia y pagina con sus opciones,
+        # sin cargar ni reordenar todas las coincidencias en cada página.
+        query = (
+            "CALL db.index.fulltext.queryNodes($index_name, $search_text, {skip: $skip, limit: $limit}) "
+            "YIELD node, score "
+            "RETURN node, score"
+        )
+        result = tx.run(query, index_name=index_name, search_text=self._escape_fulltext_query(text),
+                        skip=skip, limit=limit)
+        return [{"node": Node(label=list(record["node"].labels)[0], properties=dict(record["node"])),
+                 "score": record["score"]} for record in result]
+
+    @staticmethod
+    def _escape_fulltext_query(text: str) -> str:
+        """
+        Escapa los caracteres reservados de Lucene para buscar el texto literalmente.
+
+        Los operadores AND, OR, NOT y TO se pasan a minúsculas para que se busquen como
+        palabras; el analizador del índice ya ignora las mayúsculas.
+        """
+        escaped = ''.join(f'\\{char}' if char in LUCENE_SPECIAL_CHARACTERS else char for char in text.strip())
+        return LUCENE_OPERATORS.sub(lambda match: match.group(0).lower(), escaped)
+
+    def _recommend_movies(self, tx, movie: Node, min_rating: float, limit: int) -> List[Dict[str, Any]]:
+        """Obtiene las películas bien calificadas por las personas que reseñaron una película."""
+        movie_property_key, movie_property_value = self._node_key(movie)
+
+        query = (
+            f"MATCH (m:{movie.label} {{ {movie_property_key}: $movie_value }})<-[:BELONGS_TO]-(:Review)"
+            "<-[:MADE_A]-(p:Person)-[:MADE_A]->(r:Review)-[:BELONGS_TO]->(other:Movie) "
+            "WHERE other <> m AND r.rating >= $min_rating "
+            "WITH other, count(DISTINCT p) AS reviewers, avg(r.rating) AS average_rating "
+            "RETURN other, reviewers, average_rating "
+            "ORDER BY reviewers DESC, average_rating DESC LIMIT $limit"
+        )
+        result = tx.run(query, movie_value=movie_property_value, min_rating=min_rating, limit=limit)
+        return [{"node": Node(label=list(record["other"].labels)[0], properties=dict(record["other"])),
+                 "reviewers": record["reviewers"], "average_rating": record["average_rating"]}
+                for record in result]
+
+    def _get_similar_reviewers(self, tx, person: Node, min_shared: int, limit: int,
+                               use_precomputed: bool) -> List[Dict[str, Any]]:
+        """Obtiene las personas que reseñaron las mismas películas con calificaciones parecidas."""
+        person_property_key, person_property_value = self._node_key(person)
+        similarity_clause = PRECOMPUTED_SIMILARITY_CLAUSE if use_precomputed else SIMILARITY_CLAUSE
+
+        query = (
+            f"MATCH (p:{person.label} {{ {person_property_key}: $person_value }}) "
+            f"{similarity_clause}"
+            "RETURN other, similarity, shared_movies "
+            "ORDER BY similarity DESC, shared_movies DESC LIMIT $limit"
+        )
+        result = tx.run(query, person_value=person_property_value, min_shared=min_shared, limit=limit)
+        return [{"node": Node(label=list(record["other"].labels)[0], properties=dict(record["other"])),
+                 "similarity": record["similarity"], "shared_movies": record["shared_movies"]}
+                for record in result]
+
+    def _recommend_movies_for_person(self, tx, person: Node, min_rating: float, min_shared: int, limit: int,
+                                     use_precomputed: bool) -> List[Dict[str, Any]]:
+        """Obtiene películas no reseñadas por una persona y bien calificadas por personas similares."""
+        person_property_key, person_property_value = self._node_key(person)
+        similarity_clause = PRECOMPUTED_SIMILARITY_CLAUSE if use_precomputed else SIMILARITY_CLAUSE
+
+        query = (
+            f"MATCH (p:{person.label} {{ {person_property_key}: $person_value }}) "
+            f"{similarity_clause}"
+            "MATCH (other)-[:MADE_A]->(r:Review)-[:BELONGS_TO]->(m:Movie) "
+            "WHERE r.rating >= $min_rating AND NOT EXISTS { (p)-[:MADE_A]->(:Review)-[:BELONGS_TO]->(m) } "
+            "WITH m, other, similarity, avg(r.rating) AS other_rating "
+            "WITH m, sum(similarity) AS score, count(other) AS reviewers, avg(other_rating) AS average_rating "
+            "RETURN m, score, reviewers, average_rating "
+            "ORDER BY score DESC, average_rating DESC LIMIT $limit"
+        )
+        result = tx.run(query, person_value=person_property_value, min_rating=min_rating,
+                        min_shared=min_shared, limit=limit)
+        return [{"node": Node(label=list(record["m"].labels)[0], properties=dict(record["m"])),
+                 "score": record["score"], "reviewers": record["reviewers"],
+                 "average_rating": record["average_rating"]}
+                for record in result]
+
+    def _execute_batch(self, tx, writes: List[tuple]) -> List[WriteResult]:
+        """Aplica varias escrituras en una sola transacción de la base de datos Neo4j."""
+        operations = {
+            "create_node": self._create_node,
+            "upsert_node": lambda tx, node: self._create_node(tx, node, update_existing=True),
+            "create_relationship": self._create_relationship,
+            "delete_node": self._delete_node,
+            "delete_relationship": self._delete_relationship,
+        }
+        results = []
+        for operation, item in writes:
+            if operation not in operations:
+                raise ValueError(f"Operación de escritura desconocida: {operation}")
+            results.append(operations[operation](tx, item))
+        return results
@@ -0,0 +1,62 @@
+from dataclasses import dataclass, field
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class QueryProfile:
+    """Plan de ejecución resumido de una consulta perfilada; duration_ms se mide en el cliente."""
+    database: str
+    query: str
+    duration_ms: float
+    db_hits: int
+    rows: int
+    indexes: List[str] = field(default_factory=list)
+    operators: List[str] = field(default_factory=list)
+    plan: Optional[Dict[str, Any]] = None
+
+    @property
+    def uses_index(self) -> bool:
+        """Indica si el plan utilizó al menos un índice."""
+        return bool(self.indexes)
+
+
+class QueryProfiler:
+    """Conserva, en un montículo acotado, las consultas perfiladas más lentas."""
+
+    def __init__(self, capacity: int = 50, slow_threshold_ms: float = 0.0):
+        """
+        Constructor de la clase QueryProfiler.
+
+        Parámetros:
+        capacity (int): Número máximo de consultas que se conservan; al llenarse se descarta la más rápida.
+        slow_threshold_ms (float): Duración mínima en milisegundos para registrar una consulta.
+        """
+        self.capacity = capacity
+        self.slow_threshold_ms = slow_threshold_ms
+        # Montículo de mínimos (duración, orden de llegada, perfil): la raíz es la consulta más rápida.
+        self._profiles = []
+        self._counter = itertools.count()
+
+    def record(self, profile: QueryProfile):
+        """Registra una consulta perfilada si supera el umbral y está entre las más lentas."""
+        if profile.duration_ms < self.slow_threshold_ms or self.capacity <= 0:
+            return
+        entry = (profile.duration_ms, next(self._counter), profile)
+        if len(self._profiles) < self.capacity:
+            heapq.heappush(self._profiles, entry)
+        elif profile.duration_ms > self._profiles[0][0]:
+            heapq.heapreplace(self._profiles, entry)
+
+    def slowest(self, limit: Optional[int] = None) -> List[QueryProfile]:
+        """Obtiene las consultas registradas ordenadas de la más lenta a la más rápida."""
+        profiles = [entry[2] for entry in sorted(self._profiles, key=lambda entry: entry[0], reverse=True)]
+        return profiles[:limit] if limit is not None else profiles
+
+    def clear(self):
+        """Descarta todas las consultas registradas."""
+        self._profiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
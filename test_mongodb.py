@@ -1,16 +1,31 @@
 from mongodb_manager import MongoDBClient
+from write_buffer import MongoWriteBuffer
 
-uri = "mongodb://localhost:27017/"
-database_name = "test_db"
-try:
+
+def main():
+    uri = "mongodb://localhost:27017/"
+    database_name = "test_db"
+
+    # Crear una instancia de MongoDBClient
     client = MongoDBClient(uri, database_name)
+
     # Crear un documento
     document = {"name": "John Doe", "age": 30}
-    print(client.create_document("test_collection", document))
+    print(client.insert_document("test_collection", document))
 
     # Leer un documento
     query = {"name": "John Doe"}
-    print(client.read_document("test_collection", query))
+    print(client.fetch_document("test_collection", query))
+
+    # Buscar documentos por texto
+    print(client.create_text_index("test_collection", ["name"]))
+    print(client.search_documents("test_collection", "John"))
+
+    # Perfilar una lectura para ver si usa un índice o recorre la colección
+    with client.profiling() as profiler:
+        client.fetch_document("test_collection", query)
+    for profile in profiler.slowest(5):
+        print(profile.query, profile.db_hits, profile.rows, profile.operators, profile.indexes)
 
     # Actualizar un documento
     update = {"age": 31}
@@ -19,8 +34,26 @@ try:
     # Eliminar un documento
     print(client.delete_document("test_collection", query))
 
+    # Encolar escrituras y aplicarlas por lotes; las actualizaciones repetidas se combinan
+    with MongoWriteBuffer(client, batch_size=50) as writes:
+        writes.insert_document("test_collection", {"name": "Buffered", "age": 1})
+        writes.update_document("test_collection", {"name": "Buffered"}, {"age": 2})
+        writes.update_document("test_collection", {"name": "Buffered"}, {"city": "Wonderland"})
+    print(client.fetch_document("test_collection", {"name": "Buffered"}))
+    print(client.delete_document("test_collection", {"name": "Buffered"}))
+
     # Cerrar la conexión
-    client.close()
+    client.close_connection()
+
+    # Leer desde secundarios sin perder las escrituras propias (con una sola instancia lee del primario)
+    routed_client = MongoDBClient(uri, database_name, read_preference="secondaryPreferred", causal_consistency=True)
+    print(routed_client.insert_document("test_collection", {"name": "Jane Doe", "age": 28}))
+    print(routed_client.fetch_document("test_collection", {"name": "Jane Doe"}))
+    print(routed_client.delete_document("test_collection", {"name": "Jane Doe"}))
+    routed_client.close_connection()
 
-except ConnectionError as e:
-    print("Pucha")
\ No newline at end of file
+if __name__ == "__main__":
+    try:
+        main()
+    except (ConnectionError, RuntimeError) as e:
+        print(f"Pucha: {e}")
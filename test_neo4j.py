@@ -18,6 +18,10 @@ def main():
     print(neo4j_graph.create_node(person2))
     print(neo4j_graph.create_node(company))
 
+    # Actualizar un nodo existente en una sola consulta
+    result = neo4j_graph.upsert_node(Node(label="Person", properties={"name": "Alice", "age": 31}))
+    print(result.status, result.counters)
+
     # Crear relaciones
     relationship1 = Relationship(start_node=person1, end_node=company, relationship_type="WORKS_FOR")
     relationship2 = Relationship(start_node=person2, end_node=company, relationship_type="WORKS_FOR")
@@ -37,6 +41,20 @@ def main():
     incoming_related_nodes = neo4j_graph.get_incoming_related_nodes("WORKS_FOR", company)
     print("Incoming Related Nodes to TechCorp:", incoming_related_nodes)
 
+    # Buscar nodos mediante un índice de texto completo
+    print(neo4j_graph.create_fulltext_index("person_fulltext", "Person", ["name"]))
+    print("Search results for Alice:", neo4j_graph.search_fulltext("person_fulltext", "Alice"))
+
+    # Obtener recomendaciones a partir de las reseñas
+    print("Similar reviewers to Alice:", neo4j_graph.get_similar_reviewers(person1))
+    print("Recommended movies for Alice:", neo4j_graph.recommend_movies_for_person(person1))
+
+    # Perfilar una consulta para ver su plan de ejecución
+    with neo4j_graph.profiling() as profiler:
+        neo4j_graph.get_all_nodes("Person")
+    for profile in profiler.slowest(5):
+        print(profile.query, profile.db_hits, profile.rows, profile.operators, profile.indexes)
+
     # Eliminar una relación
     print(neo4j_graph.delete_relationship(relationship1))
 
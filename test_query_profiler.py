@@ -0,0 +1,81 @@
+import pytest
+
+from neo4j_manager import ProfilingTransaction
+from query_profiler import QueryProfile, QueryProfiler
+
+
+class FakeSummary:
+    def __init__(self, profile):
+        self.profile = profile
+
+
+class FakeResult:
+    def __init__(self, profile):
+        self._summary = FakeSummary(profile)
+
+    def __iter__(self):
+        return iter([])
+
+    def consume(self):
+        return self._summary
+
+
+class FakeTransaction:
+    """Transacción que registra las consultas recibidas y devuelve un plan mínimo."""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query, parameters=None, **kwparameters):
+        self.queries.append(query)
+        return FakeResult({"operatorType": "ProduceResults@neo4j", "rows": 1, "dbHits": 2})
+
+
+def profile(duration_ms):
+    return QueryProfile(database="neo4j", query=f"q{duration_ms}", duration_ms=duration_ms, db_hits=0, rows=0)
+
+
+def test_profiler_keeps_the_slowest_queries():
+    profiler = QueryProfiler(capacity=2)
+    for duration_ms in (5, 1, 9, 3):
+        profiler.record(profile(duration_ms))
+
+    assert [entry.duration_ms for entry in profiler.slowest()] == [9, 5]
+
+
+def test_profiler_ignores_queries_under_the_threshold():
+    profiler = QueryProfiler(slow_threshold_ms=10)
+    profiler.record(profile(5))
+
+    assert len(profiler) == 0
+
+
+@pytest.mark.parametrize("query", [
+    "CREATE (n:Person {name: $name})",
+    "CREATE (a)-[:KNOWS]->(b)",
+    "MATCH (n) RETURN n",
+    "MERGE (n:Movie {title: $title})",
+])
+def test_data_queries_are_profiled(query):
+    tx = FakeTransaction()
+    profiler = QueryProfiler()
+    ProfilingTransaction(tx, profiler).run(query)
+
+    assert tx.queries == [f"PROFILE {query}"]
+    assert len(profiler) == 1
+
+
+@pytest.mark.parametrize("query", [
+    "CREATE CONSTRAINT person_name_unique IF NOT EXISTS FOR (n:Person) REQUIRE n.name IS UNIQUE",
+    "CREATE INDEX movie_title IF NOT EXISTS FOR (n:Movie) ON (n.title)",
+    "create fulltext index review_fulltext IF NOT EXISTS FOR (n:Review) ON EACH [n.title]",
+    "DROP INDEX movie_title",
+    "  SHOW INDEXES",
+])
+def test_schema_queries_are_not_profiled(query):
+    tx = FakeTransaction()
+    profiler = QueryProfiler()
+    ProfilingTransaction(tx, profiler).run(query)
+
+    assert tx.queries == [query]
+    assert len(profiler) == 0
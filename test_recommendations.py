@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from neo4j_manager import Neo4jGraph, Node, Relationship
+
+# Las pruebas escriben y recalculan SIMILAR_TO sobre todos los nodos Person, por lo que
+# solo se ejecutan contra una base de datos de pruebas indicada expresamente.
+NEO4J_TEST_URI = os.environ.get("NEO4J_TEST_URI")
+NEO4J_TEST_USER = os.environ.get("NEO4J_TEST_USER", "neo4j")
+NEO4J_TEST_PASSWORD = os.environ.get("NEO4J_TEST_PASSWORD", "password")
+
+PEOPLE = ["test-alice", "test-bob", "test-carol"]
+MOVIES = ["test-up", "test-heat", "test-alien", "test-brazil"]
+REVIEWS = [
+    ("test-alice", "test-up", 9.0),
+    ("test-alice", "test-heat", 8.0),
+    ("test-bob", "test-up", 9.0),
+    ("test-bob", "test-heat", 8.0),
+    # Dos reseñas de la misma película por la misma persona: no deben pesar el doble.
+    ("test-bob", "test-alien", 9.0),
+    ("test-bob", "test-alien", 8.0),
+    ("test-carol", "test-up", 5.0),
+    ("test-carol", "test-brazil", 9.0),
+]
+
+pytestmark = pytest.mark.skipif(NEO4J_TEST_URI is None, reason="NEO4J_TEST_URI no está definida")
+
+
+def delete_test_data(tx):
+    tx.run("MATCH (n) WHERE n.name IN $people OR n.title IN $movies OR n.title STARTS WITH 'test-review-' "
+           "DETACH DELETE n", people=PEOPLE, movies=MOVIES)
+
+
+@pytest.fixture(scope="module")
+def graph():
+    graph = Neo4jGraph(NEO4J_TEST_URI, NEO4J_TEST_USER, NEO4J_TEST_PASSWORD)
+    graph.execute_transaction(delete_test_data)
+    for name in PEOPLE:
+        graph.create_node(Node("Person", {"name": name}))
+    for title in MOVIES:
+        graph.create_node(Node("Movie", {"title": title}))
+    for number, (name, title, rating) in enumerate(REVIEWS):
+        review = Node("Review", {"title": f"test-review-{number}", "rating": rating})
+        graph.create_node(review)
+        graph.create_relationship(Relationship(Node("Person", {"name": name}), review, "MADE_A"))
+        graph.create_relationship(Relationship(review, Node("Movie", {"title": title}), "BELONGS_TO"))
+    yield graph
+    graph.execute_transaction(delete_test_data)
+    graph.close()
+
+
+def by_key(results, key):
+    return {result["node"].properties[key]: result for result in results}
+
+
+def test_similar_reviewers_are_weighted_by_rating_distance(graph):
+    similar = by_key(graph.get_similar_reviewers(Node("Person", {"name": "test-alice"})), "name")
+
+    assert similar["test-bob"]["similarity"] == pytest.approx(1.0)
+    assert similar["test-bob"]["shared_movies"] == 2
+    assert similar["test-carol"]["similarity"] == pytest.approx(0.2)
+
+
+def test_each_similar_reviewer_counts_once_per_movie(graph):
+    recommended = by_key(graph.recommend_movies_for_person(Node("Person", {"name": "test-alice"})), "title")
+
+    assert set(recommended) == {"test-alien", "test-brazil"}
+    assert recommended["test-alien"]["score"] == pytest.approx(1.0)
+    assert recommended["test-alien"]["reviewers"] == 1
+    assert recommended["test-alien"]["average_rating"] == pytest.approx(8.5)
+    assert recommended["test-brazil"]["score"] == pytest.approx(0.2)
+
+
+def test_movies_reviewed_by_the_same_people_are_recommended(graph):
+    recommended = by_key(graph.recommend_movies(Node("Movie", {"title": "test-up"})), "title")
+
+    assert recommended["test-heat"]["reviewers"] == 2
+    assert recommended["test-alien"]["reviewers"] == 1
+    assert "test-up" not in recommended
+
+
+def test_precomputed_similarity_matches_the_live_query(graph):
+    alice = Node("Person", {"name": "test-alice"})
+    result = graph.refresh_similarity(batch_size=1)
+
+    assert result.changed
+    assert by_key(graph.get_similar_reviewers(alice, use_precomputed=True), "name").keys() == {"test-bob", "test-carol"}
+    live = by_key(graph.recommend_movies_for_person(alice), "title")
+    precomputed = by_key(graph.recommend_movies_for_person(alice, use_precomputed=True), "title")
+    assert {title: entry["score"] for title, entry in precomputed.items()} == pytest.approx(
+        {title: entry["score"] for title, entry in live.items()})
+
+    # Un segundo recálculo reemplaza las relaciones en lugar de duplicarlas.
+    graph.refresh_similarity(batch_size=2)
+    assert len(graph.get_similar_reviewers(alice, use_precomputed=True)) == 2
@@ -0,0 +1,250 @@
+from neo4j.exceptions import ClientError
+from pymongo.errors import BulkWriteError
+import pytest
+
+from neo4j_manager import Node, Relationship
+from write_buffer import BufferFullError, MongoWriteBuffer, Neo4jWriteBuffer, WriteBehindBuffer, WriteRejectedError
+
+
+class FakeMongoClient:
+    """Cliente de MongoDB que registra los bulk_write recibidos y puede fallar a pedido."""
+
+    def __init__(self):
+        self.calls = []
+        self.failures = {}
+
+    def bulk_write(self, collection_name, requests):
+        failure = self.failures.pop(collection_name, None)
+        if failure is not None:
+            applied, error = failure
+            self.calls.append((collection_name, requests[:applied]))
+            raise RuntimeError(f"Error al aplicar las operaciones: {error}") from error
+        self.calls.append((collection_name, requests))
+        return f'{len(requests)} operaciones en {collection_name}.'
+
+
+class FakeNeo4jGraph:
+    """Grafo de Neo4j que registra cada lote recibido por execute_batch."""
+
+    def __init__(self, rejected_names=()):
+        self.batches = []
+        self.rejected_names = set(rejected_names)
+
+    def execute_batch(self, writes):
+        if any(item.properties.get("name") in self.rejected_names for _, item in writes if isinstance(item, Node)):
+            raise RuntimeError("Error al ejecutar la transacción") from ClientError("constraint violation")
+        self.batches.append(writes)
+        return [operation for operation, _ in writes]
+
+
+class FakeScheduler:
+    """Planificador al estilo de Tkinter cuyas llamadas programadas se ejecutan a mano."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+
+def bulk_write_error(index):
+    return BulkWriteError({"writeErrors": [{"index": index, "code": 11000, "errmsg": "duplicate key"}],
+                           "writeConcernErrors": [], "nInserted": index, "nUpserted": 0, "nMatched": 0,
+                           "nModified": 0, "nRemoved": 0, "upserted": []})
+
+
+def sent_documents(requests):
+    return [request._doc for request in requests]
+
+
+def test_buffer_is_abstract():
+    with pytest.raises(TypeError):
+        WriteBehindBuffer()
+
+
+def test_consecutive_updates_to_the_same_document_are_coalesced():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+
+    buffer.update_document("movies", {"TITLE": "Up"}, {"year": 2009})
+    buffer.update_document("movies", {"TITLE": "Up"}, {"rating": 8.3})
+    buffer.flush()
+
+    assert [(name, sent_documents(requests)) for name, requests in client.calls] == [
+        ("movies", [{"$set": {"year": 2009, "rating": 8.3}}])]
+
+
+def test_updates_are_not_coalesced_across_other_updates_of_the_collection():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+
+    buffer.update_document("people", {"name": "A"}, {"age": 1})
+    buffer.update_document("people", {"_id": 1}, {"age": 2})
+    buffer.update_document("people", {"name": "A"}, {"age": 3})
+    buffer.flush()
+
+    assert sent_documents(client.calls[0][1]) == [{"$set": {"age": 1}}, {"$set": {"age": 2}}, {"$set": {"age": 3}}]
+
+
+def test_updates_that_change_the_query_fields_are_not_coalesced():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+
+    buffer.update_document("people", {"name": "A"}, {"name": "B"})
+    buffer.update_document("people", {"name": "A"}, {"age": 3})
+    buffer.flush()
+
+    assert len(client.calls[0][1]) == 2
+
+
+def test_updates_with_overlapping_paths_are_not_coalesced():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+
+    buffer.update_document("people", {"name": "A"}, {"address.city": "Wonderland"})
+    buffer.update_document("people", {"name": "A"}, {"address": {"city": "Oz"}})
+    buffer.update_document("people", {"name": "A"}, {"age": 3})
+    buffer.flush()
+
+    assert sent_documents(client.calls[0][1]) == [
+        {"$set": {"address.city": "Wonderland"}}, {"$set": {"address": {"city": "Oz"}, "age": 3}}]
+
+
+def test_rejected_write_is_dropped_and_the_rest_of_the_batch_is_applied():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+    buffer.insert_document("a", {"n": 1})
+    buffer.insert_document("b", {"n": 2})
+    buffer.insert_document("b", {"n": 3})
+    buffer.insert_document("b", {"n": 4})
+    client.failures["b"] = (1, bulk_write_error(1))
+
+    with pytest.raises(WriteRejectedError) as rejected:
+        buffer.flush()
+    assert [write.args[0]["n"] for _, write in rejected.value.rejections] == [3]
+    assert len(buffer) == 0
+    assert [(name, [request._doc["n"] for request in requests]) for name, requests in client.calls] == [
+        ("a", [1]), ("b", [2]), ("b", [4])]
+
+
+def test_interrupted_flush_requeues_only_the_unapplied_writes():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=10)
+    buffer.insert_document("a", {"n": 1})
+    buffer.insert_document("b", {"n": 2})
+    client.failures["b"] = (0, ConnectionError("sin conexión"))
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert len(buffer) == 1
+
+    buffer.flush()
+    assert [name for name, _ in client.calls] == ["a", "b", "b"]
+    assert client.calls[-1][1][0]._doc["n"] == 2
+
+
+def test_on_error_receives_the_unapplied_writes_and_drops_them():
+    client = FakeMongoClient()
+    errors = []
+    buffer = MongoWriteBuffer(client, batch_size=10, on_error=lambda error, writes: errors.append(writes))
+    buffer.insert_document("a", {"n": 1})
+    buffer.update_document("b", {"n": 2}, {"seen": True})
+    client.failures["b"] = (0, ConnectionError("sin conexión"))
+
+    assert buffer.flush() == []
+    assert [write.target for write in errors[0]] == ["b"]
+    assert len(buffer) == 0
+
+
+def test_max_pending_applies_backpressure_while_flushes_fail():
+    client = FakeMongoClient()
+    buffer = MongoWriteBuffer(client, batch_size=2, max_pending=2)
+    buffer.insert_document("a", {"n": 1})
+
+    # La descarga al llegar a batch_size falla, pero la escritura ya quedó aceptada.
+    client.failures["a"] = (0, ConnectionError("sin conexión"))
+    with pytest.raises(RuntimeError):
+        buffer.insert_document("a", {"n": 2})
+    assert len(buffer) == 2
+
+    # Con la cola llena y sin poder descargarla, la escritura no se acepta.
+    client.failures["a"] = (0, ConnectionError("sin conexión"))
+    with pytest.raises(BufferFullError):
+        buffer.insert_document("a", {"n": 3})
+    assert [write.args[0]["n"] for write in buffer._pending] == [1, 2]
+
+
+def test_neo4j_batch_drops_duplicates_and_merges_upserts_in_one_transaction():
+    graph = FakeNeo4jGraph()
+    buffer = Neo4jWriteBuffer(graph, batch_size=10)
+    alice = Node("Person", {"name": "Alice"})
+    review = Node("Review", {"title": "Mid"})
+
+    buffer.create_node(alice)
+    buffer.create_node(alice)
+    buffer.upsert_node(Node("Review", {"title": "Mid", "rating": 3.0}))
+    buffer.upsert_node(Node("Review", {"title": "Mid", "content": "Meh..."}))
+    buffer.create_relationship(Relationship(alice, review, "MADE_A"))
+    buffer.create_relationship(Relationship(alice, review, "MADE_A"))
+    buffer.close()
+
+    assert len(graph.batches) == 1
+    assert [operation for operation, _ in graph.batches[0]] == ["create_node", "upsert_node", "create_relationship"]
+    assert graph.batches[0][1][1].properties == {"title": "Mid", "rating": 3.0, "content": "Meh..."}
+
+
+def test_neo4j_rejected_write_is_isolated_and_the_rest_is_applied():
+    graph = FakeNeo4jGraph(rejected_names={"Bob"})
+    buffer = Neo4jWriteBuffer(graph, batch_size=10)
+    for name in ("Alice", "Bob", "Charlie", "David"):
+        buffer.create_node(Node("Person", {"name": name}))
+
+    with pytest.raises(WriteRejectedError) as rejected:
+        buffer.flush()
+    assert [write.args[0].properties["name"] for _, write in rejected.value.rejections] == ["Bob"]
+    assert [item.properties["name"] for batch in graph.batches for _, item in batch] == ["Alice", "Charlie", "David"]
+    assert len(buffer) == 0
+
+
+def test_relationship_is_retried_after_its_node_is_created():
+    graph = FakeNeo4jGraph()
+    buffer = Neo4jWriteBuffer(graph, batch_size=10)
+    alice = Node("Person", {"name": "Alice"})
+    review = Node("Review", {"title": "Mid"})
+
+    buffer.create_relationship(Relationship(alice, review, "MADE_A"))
+    buffer.create_node(alice)
+    buffer.create_relationship(Relationship(alice, review, "MADE_A"))
+    buffer.flush()
+
+    assert [operation for operation, _ in graph.batches[0]] == [
+        "create_relationship", "create_node", "create_relationship"]
+
+
+def test_scheduled_poll_flushes_writes_after_the_interval():
+    graph = FakeNeo4jGraph()
+    scheduler = FakeScheduler()
+    buffer = Neo4jWriteBuffer(graph, batch_size=10, flush_interval=60)
+    buffer.schedule_flushes(scheduler)
+
+    buffer.create_node(Node("Person", {"name": "Alice"}))
+    assert graph.batches == []
+
+    buffer.flush_interval = 0
+    scheduler.run_pending()
+    assert len(graph.batches) == 1
+    assert len(scheduler.callbacks) == 1
+
+    buffer.close()
+    assert scheduler.callbacks == {}
@@ -0,0 +1,411 @@
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
+from neo4j.exceptions import ClientError
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import time
+
+from mongodb_manager import MongoDBClient
+from neo4j_manager import Neo4jGraph, Node, Relationship
+
+
+@dataclass
+class PendingWrite:
+    """Escritura encolada a la espera de la próxima descarga."""
+    operation: str
+    target: str
+    args: tuple
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convierte diccionarios y listas en tuplas para poder usarlos como clave."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class PartialFlushError(Exception):
+    """Descarga interrumpida por error; remaining son las escrituras que no llegaron a aplicarse."""
+
+    def __init__(self, error: Exception, remaining: List[PendingWrite]):
+        super().__init__(str(error))
+        self.error = error
+        self.remaining = remaining
+
+
+class WriteRejectedError(Exception):
+    """La base de datos rechazó escrituras; rejections contiene pares (error, escritura) descartados."""
+
+    def __init__(self, rejections: List[Tuple[Exception, PendingWrite]]):
+        super().__init__(f"{len(rejections)} escrituras rechazadas: {rejections[0][0]}")
+        self.rejections = rejections
+
+
+class BufferFullError(Exception):
+    """La cola está llena y no pudo descargarse; la escritura no fue aceptada y debe reenviarse."""
+
+
+class WriteBehindBuffer(ABC):
+    """
+    Cola de escrituras diferidas que se descargan por lotes.
+
+    Las escrituras se acumulan y se aplican juntas cuando la cola alcanza batch_size o
+    cuando la escritura más antigua supera flush_interval segundos; flush() y close()
+    descargan lo pendiente de inmediato. La descarga ocurre siempre en el hilo del que
+    llama, por lo que es seguro usarla desde la interfaz de Tkinter.
+
+    El umbral de tiempo se comprueba al encolar y en cada llamada a flush_if_due(). Para
+    que una escritura aislada, o el final de una ráfaga, se descargue sin nuevas escrituras,
+    hay que llamar a schedule_flushes() con un planificador al estilo de Tkinter (por
+    ejemplo la raíz de la aplicación) o bien llamar periódicamente a flush_if_due().
+
+    Las escrituras que la base de datos rechaza (clave duplicada, validación, restricción)
+    se retiran del lote, que continúa con las siguientes; nunca se reintentan. Si la descarga
+    se interrumpe por otro motivo (por ejemplo, sin conexión), las escrituras que no
+    llegaron a aplicarse siguen pendientes.
+
+    Con on_error, este recibe la excepción y las escrituras afectadas (cada rechazo por
+    separado, y las pendientes tras una interrupción), que se descartan. Sin on_error, las
+    pendientes se conservan en la cola y flush() lanza la excepción de la interrupción, o
+    WriteRejectedError con los rechazos.
+
+    Al encolar, BufferFullError indica que la cola llegó a max_pending y no pudo
+    descargarse: la escritura no fue aceptada y debe reenviarse. Cualquier otra excepción
+    proviene de la descarga que disparó la escritura, que ya quedó aceptada en la cola.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 1.0, max_pending: int = 1000,
+                 on_error: Optional[Callable[[Exception, List[PendingWrite]], None]] = None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, batch_size)
+        self.on_error = on_error
+        self.closed = False
+        self._pending: List[PendingWrite] = []
+        self._keys: Dict[Hashable, int] = {}
+        self._oldest_write_at: Optional[float] = None
+        self._scheduler = None
+        self._scheduled_poll = None
+        self._rejections: List[Tuple[Exception, PendingWrite]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> List[Any]:
+        """Aplica todas las escrituras pendientes y devuelve los resultados de cada lote."""
+        if not self._pending:
+            return []
+
+        writes = self._pending
+        self._pending, self._keys, self._oldest_write_at = [], {}, None
+        results, error, remaining = [], None, []
+        try:
+            results = self._flush_writes(writes)
+        except PartialFlushError as e:
+            error, remaining = e.error, e.remaining
+        except Exception as e:
+            error, remaining = e, writes
+        rejections, self._rejections = self._rejections, []
+
+        if self.on_error is not None:
+            for rejection_error, rejected_write in rejections:
+                self.on_error(rejection_error, [rejected_write])
+            if error is not None:
+                self.on_error(error, remaining)
+            return results
+
+        if error is not None:
+            self._pending = remaining
+            self._oldest_write_at = time.monotonic() if remaining else None
+            if rejections:
+                raise WriteRejectedError(rejections) from error
+            raise error
+        if rejections:
+            raise WriteRejectedError(rejections)
+        return results
+
+    def flush_if_due(self) -> List[Any]:
+        """Aplica las escrituras pendientes si la más antigua superó flush_interval."""
+        if self._oldest_write_at is not None and time.monotonic() - self._oldest_write_at >= self.flush_interval:
+            return self.flush()
+        return []
+
+    def schedule_flushes(self, scheduler):
+        """
+        Comprueba el umbral de tiempo cada flush_interval segundos hasta cerrar el búfer.
+
+        scheduler debe ofrecer after(ms, callback) y after_cancel(id), como cualquier widget
+        de Tkinter, de modo que las descargas se ejecuten en el bucle de eventos.
+        """
+        self._scheduler = scheduler
+        self._schedule_poll()
+
+    def close(self) -> List[Any]:
+        """Aplica las escrituras pendientes y deja de aceptar nuevas."""
+        if self._scheduled_poll is not None:
+            self._scheduler.after_cancel(self._scheduled_poll)
+            self._scheduled_poll = None
+        results = self.flush()
+        self.closed = True
+        return results
+
+    def _schedule_poll(self):
+        """Programa la próxima comprobación del umbral de tiempo."""
+        self._scheduled_poll = self._scheduler.after(max(1, int(self.flush_interval * 1000)), self._poll)
+
+    def _poll(self):
+        """Descarga las escrituras vencidas y vuelve a programar la comprobación."""
+        self._scheduled_poll = None
+        if self.closed:
+            return
+        try:
+            self.flush_if_due()
+        finally:
+            self._schedule_poll()
+
+    def _queue(self, write: PendingWrite, key: Optional[Hashable] = None):
+        """Encola una escritura, aplicando contrapresión y descargando si se alcanza un umbral."""
+        if self.closed:
+            raise RuntimeError("El búfer de escrituras está cerrado.")
+        if len(self._pending) >= self.max_pending:
+            try:
+                self.flush()
+            except Exception as e:
+                raise BufferFullError(f"La cola de escrituras está llena ({len(self._pending)} pendientes).") from e
+
+        if key is not None:
+            self._keys[key] = len(self._pending)
+        self._pending.append(write)
+        if self._oldest_write_at is None:
+            self._oldest_write_at = time.monotonic()
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def _pending_write(self, key: Hashable) -> Optional[PendingWrite]:
+        """Obtiene la escritura pendiente que puede combinarse con una nueva de la misma clave."""
+        index = self._keys.get(key)
+        return self._pending[index] if index is not None else None
+
+    def _reject(self, error: Exception, write: PendingWrite):
+        """Retira del lote una escritura rechazada por la base de datos para informarla al terminar."""
+        self._rejections.append((error, write))
+
+    def _forget_keys(self, predicate: Callable[[Hashable], bool]):
+        """Impide que se combinen nuevas escrituras con las pendientes cuyas claves cumplen predicate."""
+        self._keys = {key: index for key, index in self._keys.items() if not predicate(key)}
+
+    @abstractmethod
+    def _flush_writes(self, writes: List[PendingWrite]) -> List[Any]:
+        """
+        Aplica un lote de escrituras, informando con _reject las que la base de datos rechace.
+
+        Si la descarga se interrumpe, lanza PartialFlushError con las escrituras no aplicadas.
+        """
+
+
+class MongoWriteBuffer(WriteBehindBuffer):
+    """Búfer de escrituras diferidas para un MongoDBClient, descargado con bulk_write."""
+
+    def __init__(self, client: MongoDBClient, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.client = client
+
+    def insert_document(self, collection_name: str, document: Dict[str, Any]):
+        """Encola la inserción de un documento en la colección especificada."""
+        self._forget_keys(lambda key: key[0] == collection_name)
+        self._queue(PendingWrite("insert", collection_name, (dict(document),)))
+
+    def update_document(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]):
+        """
+        Encola la actualización de un documento en la colección especificada.
+
+        Una actualización se combina con la última escritura pendiente de la colección solo
+        si esta es una actualización con la misma consulta y sus campos no se solapan con
+        los de aquella (por ejemplo "a" y "a.b", que MongoDB no admite en un mismo $set).
+        """
+        key = (collection_name, _freeze(query))
+        # Otra consulta podría afectar al mismo documento, así que adelantar esta actualización
+        # por delante de escrituras anteriores de la colección podría cambiar el resultado.
+        self._forget_keys(lambda pending_key: pending_key[0] == collection_name and pending_key != key)
+
+        # Si la actualización modifica los campos de la consulta, otra actualización con la
+        # misma consulta ya no afectaría al mismo documento, por lo que no se combinan.
+        query_fields = {field.split('.')[0] for field in query}
+        updated_fields = {field.split('.')[0] for field in update}
+        changes_query = bool(query_fields & updated_fields)
+
+        pending = self._pending_write(key)
+        if pending is not None and not self._conflicting_paths(pending.args[1], update):
+            pending.args[1].update(update)
+            if changes_query:
+                self._forget_keys(lambda pending_key: pending_key == key)
+            return
+        self._queue(PendingWrite("update", collection_name, (dict(query), dict(update))),
+                    None if changes_query else key)
+
+    def _conflicting_paths(self, pending_update: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        """Indica si algún campo de una actualización es prefijo de un campo distinto de la otra."""
+        return any(field.startswith(f"{other}.") or other.startswith(f"{field}.")
+                   for field in update for other in pending_update)
+
+    def delete_document(self, collection_name: str, query: Dict[str, Any]):
+        """Encola la eliminación de un documento de la colección especificada."""
+        self._forget_keys(lambda key: key[0] == collection_name)
+        self._queue(PendingWrite("delete", collection_name, (dict(query),)))
+
+    def _flush_writes(self, writes: List[PendingWrite]) -> List[str]:
+        """
+        Aplica las escrituras con un bulk_write ordenado por cada tramo consecutivo de la misma colección.
+
+        Un bulk_write ordenado aplica todo lo anterior a la primera escritura rechazada y se
+        detiene; esa escritura se retira y el tramo continúa con las siguientes. Si el error
+        no identifica la escritura rechazada, lo que no se confirmó queda pendiente.
+        """
+        results = []
+        for start, end in self._collection_runs(writes):
+            position = start
+            while position < end:
+                requests = [self._request(write) for write in writes[position:end]]
+                try:
+                    results.append(self.client.bulk_write(writes[position].target, requests))
+                    position = end
+                except Exception as e:
+                    write_errors = self._write_errors(e)
+                    if write_errors is None:
+                        raise PartialFlushError(e, writes[position:])
+                    if not write_errors:
+                        # Solo errores de write concern: el tramo completo llegó a aplicarse.
+                        raise PartialFlushError(e, writes[end:])
+                    rejected = position + write_errors[0]["index"]
+                    self._reject(e, writes[rejected])
+                    position = rejected + 1
+        return results
+
+    def _collection_runs(self, writes: List[PendingWrite]):
+        """Recorre los tramos [inicio, fin) de escrituras consecutivas sobre la misma colección."""
+        start = 0
+        for index in range(1, len(writes) + 1):
+            if index == len(writes) or writes[index].target != writes[start].target:
+                yield start, index
+                start = index
+
+    def _write_errors(self, error: Exception) -> Optional[List[Dict[str, Any]]]:
+        """Obtiene las escrituras rechazadas de un bulk_write fallido, o None si el error no las indica."""
+        cause = error.__cause__ if error.__cause__ is not None else error
+        if not isinstance(cause, BulkWriteError):
+            return None
+        return cause.details.get("writeErrors", [])
+
+    def _request(self, write: PendingWrite):
+        """Traduce una escritura pendiente a la operación de pymongo correspondiente."""
+        if write.operation == "insert":
+            return InsertOne(write.args[0])
+        if write.operation == "update":
+            return UpdateOne(write.args[0], {"$set": write.args[1]})
+        return DeleteOne(write.args[0])
+
+
+class Neo4jWriteBuffer(WriteBehindBuffer):
+    """
+    Búfer de escrituras diferidas para un Neo4jGraph, descargado en una transacción por lote.
+
+    Si la base de datos rechaza el lote (por ejemplo, por una restricción), este se divide
+    en mitades que se aplican por separado hasta aislar las escrituras rechazadas.
+    """
+
+    def __init__(self, graph: Neo4jGraph, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.graph = graph
+
+    def create_node(self, node: Node):
+        """Encola la creación de un nodo; las creaciones repetidas del mismo nodo se descartan."""
+        key = self._node_key(node)
+        pending = self._pending_write(key)
+        if pending is not None and pending.operation == "create_node":
+            return
+        self._forget_relationships_of(key)
+        self._queue(PendingWrite("create_node", node.label, (self._copy_node(node),)), key)
+
+    def upsert_node(self, node: Node):
+        """Encola la creación o actualización de un nodo; las actualizaciones repetidas se combinan."""
+        key = self._node_key(node)
+        pending = self._pending_write(key)
+        if pending is not None and pending.operation == "upsert_node":
+            pending.args[0].properties.update(node.properties)
+            return
+        self._forget_relationships_of(key)
+        self._queue(PendingWrite("upsert_node", node.label, (self._copy_node(node),)), key)
+
+    def create_relationship(self, relationship: Relationship):
+        """Encola la creación de una relación; las creaciones repetidas de la misma relación se descartan."""
+        key = self._relationship_key(relationship)
+        pending = self._pending_write(key)
+        if pending is not None and pending.operation == "create_relationship":
+            return
+        self._queue(PendingWrite("create_relationship", relationship.relationship_type, (relationship,)), key)
+
+    def delete_node(self, node: Node):
+        """Encola la eliminación de un nodo y de sus relaciones."""
+        key = self._node_key(node)
+        self._forget_keys(lambda pending_key: pending_key == key or pending_key[0] == "relationship")
+        self._queue(PendingWrite("delete_node", node.label, (node,)))
+
+    def delete_relationship(self, relationship: Relationship):
+        """Encola la eliminación de una relación entre dos nodos."""
+        key = self._relationship_key(relationship)
+        self._forget_keys(lambda pending_key: pending_key == key)
+        self._queue(PendingWrite("delete_relationship", relationship.relationship_type, (relationship,)))
+
+    def _flush_writes(self, writes: List[PendingWrite]) -> List[Any]:
+        """Aplica todas las escrituras del lote en una sola transacción, aislando las rechazadas."""
+        results = []
+        self._flush_range(writes, 0, len(writes), results)
+        return results
+
+    def _flush_range(self, writes: List[PendingWrite], start: int, end: int, results: List[Any]):
+        """Aplica writes[start:end] en una transacción; si se rechaza, divide el tramo en mitades."""
+        try:
+            results.extend(self.graph.execute_batch([(write.operation, write.args[0])
+                                                     for write in writes[start:end]]))
+            return
+        except Exception as e:
+            error = e
+        if not self._is_rejection(error):
+            raise PartialFlushError(error, writes[start:])
+        if end - start == 1:
+            self._reject(error, writes[start])
+            return
+        middle = (start + end) // 2
+        self._flush_range(writes, start, middle, results)
+        self._flush_range(writes, middle, end, results)
+
+    def _is_rejection(self, error: Exception) -> bool:
+        """Indica si la base de datos rechazó el lote, en lugar de fallar la conexión."""
+        return isinstance(error, ValueError) or isinstance(error.__cause__, ClientError)
+
+    def _forget_relationships_of(self, node_key: Hashable):
+        """Las relaciones pendientes de un nodo que se crea pueden haber fallado, así que no se combinan."""
+        self._forget_keys(lambda key: key[0] == "relationship" and node_key in (key[1], key[3]))
+
+    def _node_key(self, node: Node) -> Hashable:
+        first_key = next(iter(node.properties))
+        return "node", node.label, first_key, _freeze(node.properties[first_key])
+
+    def _relationship_key(self, relationship: Relationship) -> Hashable:
+        return ("relationship", self._node_key(relationship.start_node), relationship.relationship_type,
+                self._node_key(relationship.end_node))
+
+    def _copy_node(self, node: Node) -> Node:
+        return Node(label=node.label, properties=dict(node.properties))